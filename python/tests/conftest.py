@@ -0,0 +1,26 @@
+"""Shared pytest fixtures for prompt_fence tests."""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def keypair():
+    """Ed25519 keypair shared across the test session (keygen is comparatively slow)."""
+    from prompt_fence import generate_keypair
+
+    return generate_keypair()
+
+
+@pytest.fixture(autouse=True)
+def _preserve_awareness():
+    """Restore the global awareness instructions after each test."""
+    from prompt_fence import get_awareness_instructions, set_awareness_instructions
+
+    try:
+        original = get_awareness_instructions()
+    except ImportError:
+        # Rust core not compiled; there is no global state to restore
+        yield
+        return
+    yield
+    set_awareness_instructions(original)